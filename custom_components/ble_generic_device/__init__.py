@@ -9,7 +9,14 @@ from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.const import Platform
 
-from .const import DOMAIN, CONF_MAC, CONF_DELAY, DISCONNECT_DELAY
+from .const import (
+    DATA_UNIQUE_IDS,
+    DOMAIN,
+    CONF_MAC,
+    CONF_DELAY,
+    DISCONNECT_DELAY,
+    DeviceAddress,
+)
 from .coordinator import BLEDeviceCoordinator
 from .connection_manager import ConnectionManager
 
@@ -29,16 +36,17 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     data = {**entry.data, **(entry.options or {})}
     address: str = data[CONF_MAC]
+    addr = DeviceAddress.from_mac(address)
     
     if entry.unique_id is None:
         hass.config_entries.async_update_entry(
-            entry, unique_id=address.replace(":", "").lower()
+            entry, unique_id=addr.unique
         )
         _LOGGER.info("[%s] Set unique_id for config entry", address)
     
     # Get BLE device
     ble_device = bluetooth.async_ble_device_from_address(
-        hass, address.upper(), connectable=True
+        hass, addr.upper, connectable=True
     )
     if not ble_device:
         raise ConfigEntryNotReady(
@@ -47,12 +55,12 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     
     # Create connection manager
     disconnect_delay = data.get(CONF_DELAY, DISCONNECT_DELAY)
-    connection_mgr = ConnectionManager(hass, ble_device, disconnect_delay)
+    connection_mgr = ConnectionManager(hass, ble_device, disconnect_delay, addr)
     
     # Create coordinator
     device_name = data.get("name", f"BLE Device {address}")
     coordinator = BLEDeviceCoordinator(
-        hass, ble_device, device_name, connection_mgr
+        hass, device_name, connection_mgr, addr
     )
     
     # Store coordinator in hass.data
@@ -61,15 +69,14 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Start the coordinator (this begins listening for advertisements)
     entry.async_on_unload(coordinator.async_start())
     
-    # Wait for device to be ready
+    # Wait for device to be ready in the background; entities start out
+    # unavailable and follow the coordinator once advertisements arrive
     _LOGGER.info("[%s] Waiting for device to advertise...", address)
-    if not await coordinator.async_wait_ready():
-        raise ConfigEntryNotReady(
-            f"Device {address} is not advertising. "
-            "Please ensure the device is powered on and in range of a Bluetooth proxy."
-        )
-    
-    _LOGGER.info("[%s] Device is ready", address)
+    entry.async_create_background_task(
+        hass,
+        _async_wait_device_ready(coordinator, address),
+        f"{DOMAIN} {address} wait ready",
+    )
     
     # Set up update listener for options changes
     entry.async_on_unload(entry.add_update_listener(_async_update_listener))
@@ -80,6 +87,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_wait_device_ready(
+    coordinator: BLEDeviceCoordinator, address: str
+) -> None:
+    """Log when the device starts advertising after setup."""
+    if await coordinator.async_wait_ready():
+        _LOGGER.info("[%s] Device is ready", address)
+    else:
+        _LOGGER.warning(
+            "[%s] Device is not advertising yet. "
+            "Please ensure the device is powered on and in range of a Bluetooth proxy.",
+            address,
+        )
+
+
 async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Handle options update."""
     await hass.config_entries.async_reload(entry.entry_id)
@@ -102,3 +123,8 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             hass.data.pop(DOMAIN)
     
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Forget the unique_ids tracked for a removed config entry."""
+    hass.data.get(DATA_UNIQUE_IDS, {}).pop(entry.entry_id, None)
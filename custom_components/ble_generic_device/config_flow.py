@@ -16,6 +16,22 @@ from .const import (
     CONF_DELAY,
 )
 
+_USER_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_NAME): str,
+        vol.Required(CONF_MAC): str,
+        vol.Required(CONF_SERVICE): str,
+        vol.Optional(CONF_MANUFACTURER, default="Custom BLE"): str,
+        vol.Optional(CONF_DELAY, default=DISCONNECT_DELAY): int,
+    }
+)
+
+# Static part of the options schema; action and delay defaults are per entry
+_OPTIONS_CHAR_FIELDS = {
+    vol.Optional("name"): str,
+    vol.Optional("uuid"): str,
+}
+
 
 class BLEGenericConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Initial setup flow."""
@@ -41,16 +57,7 @@ class BLEGenericConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 data=user_input,
             )
 
-        schema = vol.Schema(
-            {
-                vol.Required(CONF_NAME): str,
-                vol.Required(CONF_MAC): str,
-                vol.Required(CONF_SERVICE): str,
-                vol.Optional(CONF_MANUFACTURER, default="Custom BLE"): str,
-                vol.Optional(CONF_DELAY, default=DISCONNECT_DELAY): int,
-            }
-        )
-        return self.async_show_form(step_id="user", data_schema=schema)
+        return self.async_show_form(step_id="user", data_schema=_USER_SCHEMA)
 
     @staticmethod
     @callback
@@ -65,14 +72,14 @@ class BLEGenericOptionsFlow(config_entries.OptionsFlow):
     def __init__(self, entry: config_entries.ConfigEntry):
         """Initialize options flow."""
         self.entry = entry
+        self._actions_cache: tuple[tuple[str, ...], dict[str, str]] | None = None
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
         # Read previously stored values (options override data)
-        chars = list(
-            self.entry.options.get(
-                CONF_CHARS, self.entry.data.get(CONF_CHARS, [])
-            )
+        # (not copied; a new list is only built when it actually changes)
+        chars = self.entry.options.get(
+            CONF_CHARS, self.entry.data.get(CONF_CHARS, [])
         )
         current_delay = self.entry.options.get(
             CONF_DELAY, self.entry.data.get(CONF_DELAY, DISCONNECT_DELAY)
@@ -85,12 +92,12 @@ class BLEGenericOptionsFlow(config_entries.OptionsFlow):
                 name = user_input.get("name")
                 uuid = user_input.get("uuid")
                 if name and uuid:
-                    chars.append({"name": name, "uuid": uuid})
+                    chars = [*chars, {"name": name, "uuid": uuid}]
 
             elif action and action.startswith("remove_"):
                 idx = int(action.split("_", 1)[1])
                 if 0 <= idx < len(chars):
-                    chars.pop(idx)
+                    chars = chars[:idx] + chars[idx + 1:]
 
             # Save updated list and delay back to options
             return self.async_create_entry(
@@ -101,16 +108,12 @@ class BLEGenericOptionsFlow(config_entries.OptionsFlow):
                 },
             )
 
-        # Build actions list
-        actions = {"add": "Add new characteristic"}
-        for i, ch in enumerate(chars):
-            actions[f"remove_{i}"] = f"Remove {ch['name']}"
+        actions = self._get_actions(chars)
 
         schema = vol.Schema(
             {
                 vol.Required("action", default="add"): vol.In(actions),
-                vol.Optional("name"): str,
-                vol.Optional("uuid"): str,
+                **_OPTIONS_CHAR_FIELDS,
                 vol.Optional(
                     CONF_DELAY,
                     default=current_delay,
@@ -130,3 +133,13 @@ class BLEGenericOptionsFlow(config_entries.OptionsFlow):
             data_schema=schema,
             description_placeholders={"chars": description},
         )
+
+    def _get_actions(self, chars) -> dict[str, str]:
+        """Return the actions list, rebuilt only when the names change."""
+        key = tuple(ch["name"] for ch in chars)
+        if self._actions_cache is None or self._actions_cache[0] != key:
+            actions = {"add": "Add new characteristic"}
+            for i, name in enumerate(key):
+                actions[f"remove_{i}"] = f"Remove {name}"
+            self._actions_cache = (key, actions)
+        return self._actions_cache[1]
@@ -4,52 +4,62 @@ from __future__ import annotations
 import asyncio
 import logging
 
-from homeassistant.helpers.event import async_call_later
 from homeassistant.components import bluetooth
-from bleak import BleakClient
-from bleak.exc import BleakError
+from bleak.backends.device import BLEDevice
+from bleak.exc import BleakCharacteristicNotFoundError, BleakError
 from bleak_retry_connector import (
     establish_connection,
+    BleakClientWithServiceCache,
     BleakConnectionError,
     BleakNotFoundError,
 )
 
-from .const import DISCONNECT_DELAY, BLEDeviceNotAvailable
+from .const import BLEDeviceNotAvailable, DeviceAddress
 
 _LOGGER = logging.getLogger(__name__)
 
+WRITE_TIMEOUT = 15  # seconds - budget for connecting plus one write
+
 
 class ConnectionManager:
     """Keeps BLE device connection open briefly after last command."""
 
-    def __init__(self, hass, ble_device, delay):
+    def __init__(self, hass, ble_device, delay, addr: DeviceAddress):
         """Initialize the connection manager."""
         self.hass = hass
         self._ble_device = ble_device
+        self._addr = addr
+        self._device_resolved = isinstance(ble_device, BLEDevice)
         self._delay = delay
-        self._lock = asyncio.Lock()
-        self._disconnect_handle = None
+        self._deadline = 0.0
         self._client = None
+        # Probe once for an HA-level write helper (not in current releases)
+        write_func = getattr(bluetooth, "async_write_characteristic", None)
+        self._ha_write_func = write_func if callable(write_func) else None
+        self._write_response: dict[str, bool] = {}
+        self._write_queue: asyncio.Queue = asyncio.Queue()
+        self._closed = False
+        self._worker_task = hass.async_create_background_task(
+            self._writer_loop(), f"ble_generic_device {addr.upper} writer"
+        )
 
     def is_connected(self) -> bool:
         """Return True if currently connected."""
         return self._client is not None and self._client.is_connected
 
+    def update_ble_device(self, ble_device):
+        """Use a fresh BLEDevice received from an advertisement."""
+        self._ble_device = ble_device
+        self._device_resolved = isinstance(ble_device, BLEDevice)
+
     async def _resolve_device(self):
         """Ensure we have a valid BLEDevice object."""
-        # If already a proper BLEDevice, return it
-        if hasattr(self._ble_device, "details"):
+        # Cached BLEDevice (kept fresh by the coordinator) is the common case
+        if self._device_resolved:
             return self._ble_device
         
-        # Otherwise try to resolve from address
-        address = (
-            self._ble_device 
-            if isinstance(self._ble_device, str) 
-            else getattr(self._ble_device, "address", None)
-        )
-        
-        if not address:
-            raise BLEDeviceNotAvailable("Cannot determine BLE device address")
+        # Otherwise fall back to resolving from address
+        address = self._addr.upper
         
         ble_dev = bluetooth.async_ble_device_from_address(
             self.hass, address, connectable=True
@@ -62,6 +72,7 @@ class ConnectionManager:
         
         _LOGGER.debug("[%s] Resolved BLEDevice", address)
         self._ble_device = ble_dev
+        self._device_resolved = True
         return ble_dev
 
     async def _ensure_client(self):
@@ -74,27 +85,29 @@ class ConnectionManager:
             return self._client
     
         # Clean up old client if exists but not connected
-        if self._client:
-            try:
-                await self._client.disconnect()
-            except Exception:
-                pass
-            self._client = None
+        await self._async_drop_client()
     
         # Establish new connection
         _LOGGER.debug("[%s] Establishing connection", device.address)
         try:
             self._client = await establish_connection(
-                BleakClient,
+                BleakClientWithServiceCache,
                 device,
                 device.name or device.address,
                 use_services_cache=True,
             )
     
-            # Ensure services are discovered
-            if not self._client.services:
-                _LOGGER.debug("[%s] Services not cached, discovering...", device.address)
-                await self._client.get_services()
+            # Services are resolved during connect; bleak raises if none were
+            try:
+                services = self._client.services
+            except BleakError:
+                services = None
+            if services is None or not services.services:
+                await self._invalidate_services()
+                await self._async_drop_client()
+                raise BLEDeviceNotAvailable(
+                    f"No GATT services resolved for {device.address}"
+                )
     
         except (BleakConnectionError, BleakNotFoundError, TimeoutError) as err:
             _LOGGER.warning(
@@ -102,6 +115,8 @@ class ConnectionManager:
                 device.address,
                 err,
             )
+            # Device may be stale, look it up again on the next attempt
+            self._device_resolved = False
             raise BLEDeviceNotAvailable(
                 f"Could not connect to {device.address}"
             ) from err
@@ -109,169 +124,322 @@ class ConnectionManager:
         _LOGGER.debug("[%s] Connected", device.address)
         return self._client
 
-    async def write(self, char_uuid: str, value: bytes):
-        """Write value to characteristic and refresh linger timer."""
-        async with self._lock:
-            device_addr = getattr(self._ble_device, "address", str(self._ble_device))
+    async def _invalidate_services(self):
+        """Clear the services cache so the next connect rediscovers them."""
+        _LOGGER.debug(
+            "[%s] Service cache stale, clearing",
+            self._addr.upper,
+        )
+        self._write_response.clear()
+        if self._client:
+            try:
+                await self._client.clear_cache()
+            except (BleakError, OSError, asyncio.TimeoutError):
+                pass
+
+    async def write(
+        self, char_uuid: str, value: bytes | bytearray | memoryview
+    ) -> bool:
+        """Write value to characteristic and refresh linger timer.
+
+        Returns True if the device acknowledged the write, False if it was
+        sent without response.
+        """
+        return await self._submit(char_uuid, value)
+
+    def _submit(
+        self, char_uuid: str, value: bytes | bytearray | memoryview
+    ) -> asyncio.Future:
+        """Hand a write to the writer task and return its result future."""
+        if self._closed:
+            raise BLEDeviceNotAvailable(
+                f"Connection manager for {self._addr.upper} is closed"
+            )
+        # Writes wait in the queue, so snapshot mutable buffers; bytes
+        # (the common case) is passed through without a copy
+        if type(value) is not bytes:
+            value = bytes(value)
+        future = self.hass.loop.create_future()
+        self._write_queue.put_nowait((char_uuid, value, future))
+        return future
+
+    async def _writer_loop(self):
+        """Own the client: process queued writes and the linger disconnect."""
+        while True:
+            try:
+                char_uuid, value, future = await self._async_next_write()
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                # Never let the loop die; queued writes would wait forever
+                _LOGGER.warning(
+                    "[%s] Unexpected error in writer task: %s (%s)",
+                    self._addr.upper,
+                    err,
+                    type(err).__name__,
+                )
+                self._client = None
+                continue
+            
+            # Skip writes whose caller has already given up
+            if future.done():
+                continue
             
+            # Each write succeeds or fails on its own; a failure drops the
+            # client so the next write gets a fresh connection attempt
+            try:
+                acked = await self._async_write_item(char_uuid, value)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as err:
+                if not future.done():
+                    future.set_exception(err)
+            else:
+                if not future.done():
+                    future.set_result(acked)
+
+    async def _async_next_write(self):
+        """Wait for the next write, disconnecting once the linger delay passes."""
+        while self._client is not None:
+            remaining = self._deadline - self.hass.loop.time()
+            if remaining <= 0:
+                await self._async_disconnect()
+                break
             try:
-                # First, try using HA's high-level write function (faster)
-                write_func = getattr(bluetooth, "async_write_characteristic", None)
-                
-                if callable(write_func):
-                    _LOGGER.debug(
-                        "[%s] Writing %s to %s (HA method)",
-                        device_addr,
-                        value.hex(),
-                        char_uuid,
-                    )
-                    try:
-                        device = await self._resolve_device()
-                        # Add timeout to write operation
-                        async with asyncio.timeout(5):  # 5 second timeout
-                            await write_func(self.hass, device, char_uuid, value)
-                    except (BleakError, TimeoutError, asyncio.TimeoutError) as err:
-                        _LOGGER.warning(
-                            "[%s] HA write method failed: %s, trying direct connection",
-                            device_addr,
-                            err,
-                        )
-                        # Fall back to direct connection
-                        async with asyncio.timeout(10):  # 10 second timeout for connection + write
-                            client = await self._ensure_client()
-                            await client.write_gatt_char(char_uuid, value, response=True)
-                else:
-                    # Use direct Bleak connection
-                    _LOGGER.debug(
-                        "[%s] Writing %s to %s (Bleak method)",
-                        device_addr,
-                        value.hex(),
-                        char_uuid,
-                    )
-                    async with asyncio.timeout(10):  # 10 second timeout
-                        client = await self._ensure_client()
-                        await client.write_gatt_char(char_uuid, value, response=True)
-                
+                return await asyncio.wait_for(self._write_queue.get(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        
+        return await self._write_queue.get()
+
+    async def _async_write_item(self, char_uuid: str, value: bytes) -> bool:
+        """Write one queued value with its own time budget."""
+        device_addr = self._addr.upper
+        
+        try:
+            # The budget covers connecting (if needed) and this write
+            async with asyncio.timeout(WRITE_TIMEOUT):
+                acked = await self._async_write_one(device_addr, char_uuid, value)
+            
+            _LOGGER.debug(
+                "[%s] Successfully wrote to %s",
+                device_addr,
+                char_uuid,
+            )
+            return acked
+            
+        except BLEDeviceNotAvailable:
+            # Re-raise our custom exception
+            raise
+        except BleakCharacteristicNotFoundError as err:
+            _LOGGER.error(
+                "[%s] Characteristic %s not found: %s",
+                device_addr,
+                char_uuid,
+                err,
+            )
+            # Handles changed on the device, cached services are stale
+            await self._invalidate_services()
+            await self._async_drop_client()
+            
+            raise BLEDeviceNotAvailable(
+                f"Characteristic {char_uuid} not found on {device_addr}"
+            ) from err
+        except (asyncio.TimeoutError, TimeoutError) as err:
+            _LOGGER.error(
+                "[%s] Write timeout to %s (device likely offline)",
+                device_addr,
+                char_uuid,
+            )
+            # Clean up failed client
+            await self._async_drop_client()
+            
+            raise BLEDeviceNotAvailable(
+                f"Device {device_addr} write timeout (likely offline)"
+            ) from err
+        except (BleakError, BleakConnectionError, BleakNotFoundError) as err:
+            _LOGGER.error(
+                "[%s] Write failed to %s: %s (%s)",
+                device_addr,
+                char_uuid,
+                err,
+                type(err).__name__,
+            )
+            # Clean up failed client
+            await self._async_drop_client()
+            
+            # Convert to our exception
+            raise BLEDeviceNotAvailable(
+                f"Device {device_addr} not available for write operation"
+            ) from err
+        except Exception as err:
+            _LOGGER.error(
+                "[%s] Unexpected error writing to %s: %s (%s)",
+                device_addr,
+                char_uuid,
+                err,
+                type(err).__name__,
+            )
+            if _LOGGER.isEnabledFor(logging.DEBUG):
                 _LOGGER.debug(
-                    "[%s] Successfully wrote to %s",
-                    device_addr,
-                    char_uuid,
+                    "[%s] Unexpected write error details", device_addr, exc_info=True
                 )
-                
-            except BLEDeviceNotAvailable:
-                # Re-raise our custom exception
-                raise
-            except (asyncio.TimeoutError, TimeoutError) as err:
-                _LOGGER.error(
-                    "[%s] Write timeout to %s (device likely offline)",
+            # Clean up
+            await self._async_drop_client()
+            raise
+        
+        finally:
+            # Always extend the linger deadline (even on failure)
+            self._extend_connection()
+
+    async def _async_write_one(
+        self, device_addr: str, char_uuid: str, value: bytes
+    ) -> bool:
+        """Write a single characteristic, reusing the open connection."""
+        # First, try using HA's high-level write function (faster)
+        if self._ha_write_func is not None:
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "[%s] Writing %s to %s (HA method)",
                     device_addr,
+                    value.hex(),
                     char_uuid,
                 )
-                # Clean up failed client
-                if self._client:
-                    try:
-                        await self._client.disconnect()
-                    except Exception:
-                        pass
-                    self._client = None
-                
-                raise BLEDeviceNotAvailable(
-                    f"Device {device_addr} write timeout (likely offline)"
-                ) from err
-            except (BleakError, BleakConnectionError, BleakNotFoundError) as err:
-                _LOGGER.error(
-                    "[%s] Write failed to %s: %s (%s)",
+            try:
+                device = await self._resolve_device()
+                await self._ha_write_func(self.hass, device, char_uuid, value)
+                # The helper doesn't say which write type it used
+                return False
+            except BleakError as err:
+                _LOGGER.warning(
+                    "[%s] HA write method failed: %s, trying direct connection",
                     device_addr,
-                    char_uuid,
                     err,
-                    type(err).__name__,
                 )
-                # Clean up failed client
-                if self._client:
-                    try:
-                        await self._client.disconnect()
-                    except Exception:
-                        pass
-                    self._client = None
-                
-                # Convert to our exception
-                raise BLEDeviceNotAvailable(
-                    f"Device {device_addr} not available for write operation"
-                ) from err
-            except Exception as err:
-                _LOGGER.error(
-                    "[%s] Unexpected error writing to %s: %s (%s)",
+                # Fall back to direct connection
+                client = await self._ensure_client()
+                return await self._async_client_write(client, char_uuid, value)
+        else:
+            # Use direct Bleak connection
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "[%s] Writing %s to %s (Bleak method)",
                     device_addr,
+                    value.hex(),
                     char_uuid,
+                )
+            client = await self._ensure_client()
+            return await self._async_client_write(client, char_uuid, value)
+
+    async def _async_client_write(self, client, char_uuid: str, value: bytes) -> bool:
+        """Write via Bleak, skipping the ACK when the characteristic allows it.
+
+        Returns True if the write was acknowledged.
+        """
+        response = self._write_response.get(char_uuid)
+        if response is None:
+            char = client.services.get_characteristic(char_uuid)
+            response = (
+                char is None or "write-without-response" not in char.properties
+            )
+            self._write_response[char_uuid] = response
+        
+        if response:
+            await client.write_gatt_char(char_uuid, value, response=True)
+            return True
+        
+        try:
+            await client.write_gatt_char(char_uuid, value, response=False)
+            return False
+        except BleakCharacteristicNotFoundError:
+            raise
+        except BleakError as err:
+            _LOGGER.debug(
+                "[%s] Write without response to %s failed (%s), using acked writes",
+                self._addr.upper,
+                char_uuid,
+                err,
+            )
+            self._write_response[char_uuid] = True
+            await client.write_gatt_char(char_uuid, value, response=True)
+            return True
+
+    async def _async_drop_client(self):
+        """Disconnect and forget the current client, ignoring errors."""
+        if self._client:
+            try:
+                await self._client.disconnect()
+            except (BleakError, OSError, asyncio.TimeoutError):
+                pass
+            except Exception as err:
+                # Don't let a failed cleanup mask the caller's error
+                _LOGGER.warning(
+                    "[%s] Unexpected error dropping client: %s (%s)",
+                    self._addr.upper,
                     err,
                     type(err).__name__,
                 )
-                # Clean up
-                if self._client:
-                    try:
-                        await self._client.disconnect()
-                    except Exception:
-                        pass
-                    self._client = None
-                raise
-            
             finally:
-                # Always extend connection timer (even on failure)
-                self._extend_connection()
+                self._client = None
 
     def _extend_connection(self):
-        """Extend the connection linger timer."""
-        # Cancel existing timer
-        if self._disconnect_handle:
-            self._disconnect_handle()
-            self._disconnect_handle = None
+        """Extend the connection linger deadline."""
+        # Only linger if we have a client
+        if not self._client:
+            return
         
-        # Only schedule disconnect if we have a client
-        if self._client:
-            self._disconnect_handle = async_call_later(
-                self.hass, self._delay, self._async_disconnect
-            )
+        # The writer loop disconnects once the deadline passes idle
+        self._deadline = self.hass.loop.time() + self._delay
+        
+        if _LOGGER.isEnabledFor(logging.DEBUG):
             _LOGGER.debug(
                 "[%s] Extended connection timer (%s seconds)",
-                getattr(self._ble_device, "address", "unknown"),
+                self._addr.upper,
                 self._delay,
             )
 
-    async def _async_disconnect(self, *_):
+    async def _async_disconnect(self):
         """Disconnect from device after idle period."""
-        device_addr = getattr(self._ble_device, "address", "unknown")
-        
-        # Clear the handle first
-        if self._disconnect_handle:
-            self._disconnect_handle()
-            self._disconnect_handle = None
+        device_addr = self._addr.upper
         
         # Disconnect if still connected
-        if self._client and self._client.is_connected:
-            try:
+        try:
+            if self._client.is_connected:
                 _LOGGER.debug(
                     "[%s] Disconnecting after %s seconds idle",
                     device_addr,
                     self._delay,
                 )
                 await self._client.disconnect()
-            except Exception as err:
-                _LOGGER.warning(
-                    "[%s] Error during disconnect: %s",
-                    device_addr,
-                    err,
-                )
-            finally:
-                self._client = None
+        except Exception as err:
+            _LOGGER.warning(
+                "[%s] Error during disconnect: %s (%s)",
+                device_addr,
+                err,
+                type(err).__name__,
+            )
+        finally:
+            self._client = None
 
     async def async_close(self):
-        """Clean up connection and timers."""
-        device_addr = getattr(self._ble_device, "address", "unknown")
+        """Clean up connection and writer task."""
+        device_addr = self._addr.upper
+        
+        # Stop the writer task before touching the client it owns
+        self._closed = True
+        self._worker_task.cancel()
+        try:
+            await self._worker_task
+        except asyncio.CancelledError:
+            pass
+        except Exception as err:
+            _LOGGER.warning("[%s] Writer task failed: %s", device_addr, err)
         
-        # Cancel disconnect timer
-        if self._disconnect_handle:
-            self._disconnect_handle()
-            self._disconnect_handle = None
+        # Fail writes still queued
+        while not self._write_queue.empty():
+            _, _, future = self._write_queue.get_nowait()
+            future.cancel()
         
         # Disconnect client
         if self._client:
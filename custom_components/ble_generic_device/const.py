@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
 DOMAIN = "ble_generic_device"
 
 CONF_MAC = "mac_address"
@@ -11,6 +15,24 @@ CONF_DELAY = "disconnect_delay"
 DEVICE_STARTUP_TIMEOUT_SECONDS = 30
 # delay before releasing the connection
 DISCONNECT_DELAY = 15 
+# hass.data key for the switch unique_ids last set up per entry (kept across reloads)
+DATA_UNIQUE_IDS = f"{DOMAIN}_unique_ids"
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceAddress:
+    """Normalized forms of a device MAC address, computed once per entry."""
+
+    upper: str
+    unique: str
+
+    @classmethod
+    def from_mac(cls, mac: str) -> DeviceAddress:
+        """Build all address forms from a configured MAC address."""
+        return cls(
+            upper=mac.upper(),
+            unique=mac.replace(":", "").lower(),
+        )
 
 
 class BLEDeviceNotAvailable(Exception):
@@ -4,16 +4,15 @@ from __future__ import annotations
 import asyncio
 import contextlib
 import logging
-from datetime import datetime
 
 from homeassistant.components import bluetooth
 from homeassistant.components.bluetooth.active_update_coordinator import (
     ActiveBluetoothDataUpdateCoordinator,
 )
 from homeassistant.core import HomeAssistant, callback
-from bleak.backends.device import BLEDevice
 
 from .connection_manager import ConnectionManager
+from .const import DeviceAddress
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -27,25 +26,27 @@ class BLEDeviceCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
     def __init__(
         self,
         hass: HomeAssistant,
-        ble_device: BLEDevice,
         device_name: str,
         connection_mgr: ConnectionManager,
+        addr: DeviceAddress,
     ) -> None:
         """Initialize the coordinator."""
         super().__init__(
             hass=hass,
             logger=_LOGGER,
-            address=ble_device.address,
+            address=addr.upper,
             needs_poll_method=self._needs_poll,
             poll_method=self._async_update,
             mode=bluetooth.BluetoothScanningMode.ACTIVE,
             connectable=True,
         )
-        self.ble_device = ble_device
+        self.addr = addr
+        # self.address (set by the base class) is addr.upper
+        self.address_normalized = addr.unique
         self.device_name = device_name
         self.connection_mgr = connection_mgr
         self._ready_event = asyncio.Event()
-        self._last_seen: datetime | None = None
+        self._last_seen_monotonic: float | None = None
         self._manually_marked_unavailable = False  # Track manual unavailability from write failure
         
         # Override the unavailable timeout
@@ -53,21 +54,16 @@ class BLEDeviceCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
         
         _LOGGER.info(
             "[%s] Coordinator initialized with %ds unavailability timeout",
-            ble_device.address,
+            addr.upper,
             UNAVAILABLE_TIMEOUT,
         )
 
     @property
     def available(self) -> bool:
         """Return if the device is available."""
-        # If actively connected, always available
+        # If actively connected, always available (hot path, no other work)
         if self.connection_mgr.is_connected():
-            if self._manually_marked_unavailable:
-                _LOGGER.debug(
-                    "[%s] Available (connected), clearing manual unavailable flag",
-                    self.ble_device.address,
-                )
-                self._manually_marked_unavailable = False
+            self._manually_marked_unavailable = False
             return True
         
         # If manually marked unavailable due to write failure, stay unavailable
@@ -75,18 +71,26 @@ class BLEDeviceCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
         if self._manually_marked_unavailable:
             _LOGGER.debug(
                 "[%s] Unavailable (manually marked after write failure)",
-                self.ble_device.address,
+                self.addr.upper,
             )
             return False
         
+        # Until the first advertisement arrives the parent flag only says
+        # that setup found a BLEDevice, so stay unavailable until then
+        if not self._ready_event.is_set():
+            return False
+        
         # Otherwise use parent's availability logic (based on advertisements)
         parent_available = super().available
         
-        if self._last_seen:
-            age = (datetime.utcnow() - self._last_seen).total_seconds()
+        if (
+            self._last_seen_monotonic is not None
+            and _LOGGER.isEnabledFor(logging.DEBUG)
+        ):
+            age = self.hass.loop.time() - self._last_seen_monotonic
             _LOGGER.debug(
                 "[%s] Availability: %s (last_seen %.1fs ago, threshold %ds)",
-                self.ble_device.address,
+                self.addr.upper,
                 parent_available,
                 age,
                 UNAVAILABLE_TIMEOUT,
@@ -96,9 +100,12 @@ class BLEDeviceCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
 
     def mark_write_failed(self):
         """Mark that a write operation failed - makes coordinator unavailable."""
+        if self._manually_marked_unavailable:
+            return
+        
         _LOGGER.warning(
             "[%s] Write operation failed, marking unavailable until next advertisement",
-            self.ble_device.address,
+            self.addr.upper,
         )
         self._manually_marked_unavailable = True
         
@@ -126,12 +133,12 @@ class BLEDeviceCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
     ) -> None:
         """Handle the device going unavailable."""
         time_since_last_seen = None
-        if self._last_seen:
-            time_since_last_seen = (datetime.utcnow() - self._last_seen).total_seconds()
+        if self._last_seen_monotonic is not None:
+            time_since_last_seen = self.hass.loop.time() - self._last_seen_monotonic
         
         _LOGGER.warning(
             "[%s] Device became UNAVAILABLE via coordinator (last seen %.1fs ago)",
-            self.ble_device.address,
+            self.addr.upper,
             time_since_last_seen if time_since_last_seen else 0,
         )
         
@@ -145,9 +152,12 @@ class BLEDeviceCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
         change: bluetooth.BluetoothChange,
     ) -> None:
         """Handle a Bluetooth event (advertisement received)."""
-        # Update BLE device reference
-        self.ble_device = service_info.device
-        self._last_seen = datetime.utcnow()
+        # Keep the latest advertisement for the base class
+        self._last_service_info = service_info
+        was_available = self._available
+        self._available = True
+        self.connection_mgr.update_ble_device(service_info.device)
+        self._last_seen_monotonic = self.hass.loop.time()
         
         proxy_name = getattr(service_info, "source", "unknown")
         rssi = getattr(service_info, "rssi", "unknown")
@@ -158,7 +168,7 @@ class BLEDeviceCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
         if was_manually_unavailable:
             _LOGGER.info(
                 "[%s] Device recovered - advertisement received via proxy '%s' (RSSI: %s)",
-                self.ble_device.address,
+                self.addr.upper,
                 proxy_name,
                 rssi,
             )
@@ -166,26 +176,29 @@ class BLEDeviceCoordinator(ActiveBluetoothDataUpdateCoordinator[None]):
         else:
             _LOGGER.debug(
                 "[%s] Advertisement via proxy '%s' (RSSI: %s, change: %s)",
-                self.ble_device.address,
+                self.addr.upper,
                 proxy_name,
                 rssi,
                 change,
             )
         
         # Mark as ready
+        was_ready = self._ready_event.is_set()
         self._ready_event.set()
         
-        # If we just recovered from manual unavailability, force an extra update
+        # If we just recovered from manual unavailability, refresh entities once
+        # (characteristics are write-only, so there is nothing to read back)
         if was_manually_unavailable:
             self.async_update_listeners()
 
-            # Schedule a task to read all characteristics after recovery
-            self.hass.async_create_task(self._async_refresh_all_states())
-
             _LOGGER.info(
                 "[%s] Forced entity updates after recovery",
-                self.ble_device.address,
+                self.addr.upper,
             )
+        elif not was_available or not was_ready:
+            # First advertisement or back from advertisement timeout;
+            # entities sync availability on update
+            self.async_update_listeners()
 
     async def async_wait_ready(self) -> bool:
         """Wait for the device to be ready."""
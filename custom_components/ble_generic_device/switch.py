@@ -2,115 +2,154 @@
 from __future__ import annotations
 
 import logging
+from functools import lru_cache
 
-from homeassistant.components.switch import SwitchEntity
-from homeassistant.core import callback
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN, SwitchEntity
+from homeassistant.core import State, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers import restore_state
 from homeassistant.helpers.restore_state import RestoreEntity
 
 from .coordinator import BLEDeviceCoordinator
-from .const import DOMAIN, BLEDeviceNotAvailable
+from .const import DATA_UNIQUE_IDS, DOMAIN, BLEDeviceNotAvailable
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=512)
+def _make_unique_id(address_normalized: str, char_uuid: str) -> str:
+    """Return the unique_id of the switch for a device characteristic."""
+    return f"{address_normalized}_{char_uuid[-8:]}"
+
+
 class BLECharSwitch(CoordinatorEntity, SwitchEntity, RestoreEntity):
     """A BLE characteristic represented as a switch."""
 
+    # HA's entity bases keep a __dict__; this only covers our own fields
+    __slots__ = (
+        "_char_uuid",
+        "_entry",
+        "_state_confirmed",
+        "_restored_state",
+        "_log_prefix",
+    )
+
+    # Immutable and shared by every write, so nothing is allocated per toggle
+    _ON_PAYLOAD = b"\x01"
+    _OFF_PAYLOAD = b"\x00"
+    _ON_ACTION = "turn on"
+    _OFF_ACTION = "turn off"
+
     def __init__(
         self,
         coordinator: BLEDeviceCoordinator,
         name: str,
         char_uuid: str,
         entry,
+        restored_state: State | None = None,
     ):
         """Initialize the BLE switch."""
         super().__init__(coordinator)
         self._attr_name = name
         self._char_uuid = char_uuid
         self._entry = entry
+        self._log_prefix = f"[{coordinator.address}] {name}"
         self._attr_is_on = False
-        self._attr_unique_id = (
-            f"{coordinator.ble_device.address.replace(':', '').lower()}_{char_uuid[-8:]}"
+        self._restored_state = restored_state
+        self._attr_available = coordinator.available
+        # True once this session wrote the current state to the device and
+        # it acknowledged the write; a restored state or an unacked write is
+        # not trusted for skipping writes, and the flag is cleared whenever
+        # the device goes unavailable
+        self._state_confirmed = False
+        self._attr_unique_id = _make_unique_id(
+            coordinator.address_normalized, char_uuid
         )
+        
+        # Device metadata for the UI; entry data is fixed for this entity
+        data = getattr(entry, "data", {})
+        self._attr_device_info = {
+            "identifiers": {(DOMAIN, coordinator.address)},
+            "connections": {("bluetooth", coordinator.address)},
+            "name": data.get("name", f"BLE Device {coordinator.address}"),
+            "manufacturer": data.get("manufacturer", "Custom BLE"),
+        }
 
     async def async_added_to_hass(self):
         """Restore last known state."""
         await super().async_added_to_hass()
         
-        # Restore last state
-        last = await self.async_get_last_state()
+        # The listener is only registered now; catch up on any coordinator
+        # update (e.g. the first advertisement) that arrived before it
+        self._attr_available = self.coordinator.available
+        
+        # Apply the last state looked up once per entry at platform setup
+        last = self._restored_state
+        self._restored_state = None
         if last is not None:
             self._attr_is_on = last.state == "on"
             _LOGGER.debug(
-                "[%s] Restored state for %s: %s",
-                self.coordinator.ble_device.address,
-                self._attr_name,
-                self._attr_is_on,
+                "%s: restored state is_on=%s", self._log_prefix, self._attr_is_on
             )
 
-
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        # Log availability changes
-        _LOGGER.debug(
-            "[%s] %s coordinator update, available=%s",
-            self.coordinator.ble_device.address,
-            self._attr_name,
-            self.coordinator.available,
-        )
+        """Sync availability from the coordinator, then write state."""
+        self._attr_available = self.coordinator.available
+        # The device may have rebooted or lost its state while away
+        if not self._attr_available:
+            self._state_confirmed = False
         super()._handle_coordinator_update()
 
-    async def _async_write_with_availability_check(self, value: bytes, action: str):
-        """Write value with availability check and error handling."""
-        device_addr = self.coordinator.ble_device.address
+    async def _async_write_with_availability_check(
+        self, value: bytes, action: str
+    ) -> bool:
+        """Write value with availability check and error handling.
+
+        Returns True if the device acknowledged the write.
+        """
+        device_addr = self.coordinator.address
         
         try:
             # Pre-check: is coordinator available?
             if not self.coordinator.available:
                 _LOGGER.warning(
-                    "[%s] Cannot %s %s - coordinator reports unavailable",
-                    device_addr,
+                    "%s: cannot %s - coordinator reports unavailable",
+                    self._log_prefix,
                     action,
-                    self._attr_name,
                 )
                 raise HomeAssistantError(
                     f"Device {device_addr} is not available"
                 )
             
-            _LOGGER.debug(
-                "[%s] Attempting to %s %s (writing %s to %s)",
-                device_addr,
-                action,
-                self._attr_name,
-                value.hex(),
-                self._char_uuid,
-            )
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(
+                    "%s: attempting to %s (writing %s to %s)",
+                    self._log_prefix,
+                    action,
+                    value.hex(),
+                    self._char_uuid,
+                )
             
             # Attempt the write
-            await self.coordinator.connection_mgr.write(self._char_uuid, value)
-            
-            _LOGGER.info(
-                "[%s] Successfully %s %s",
-                device_addr,
-                action,
-                self._attr_name,
+            acked = await self.coordinator.connection_mgr.write(
+                self._char_uuid, value
             )
             
+            _LOGGER.info("%s: %s succeeded", self._log_prefix, action)
+            return acked
+            
         except BLEDeviceNotAvailable as err:
             _LOGGER.error(
-                "[%s] Device not available for %s %s: %s",
-                device_addr,
-                action,
-                self._attr_name,
-                err,
+                "%s: device not available to %s: %s", self._log_prefix, action, err
             )
             
             # Mark coordinator as unavailable - this will affect ALL entities
-            self.coordinator.mark_write_failed()
+            # (skip the fan-out if it is already known to be down)
+            if self.coordinator.available:
+                self.coordinator.mark_write_failed()
             
             raise HomeAssistantError(
                 f"Device not available: {err}"
@@ -118,10 +157,9 @@ class BLECharSwitch(CoordinatorEntity, SwitchEntity, RestoreEntity):
             
         except Exception as err:
             _LOGGER.error(
-                "[%s] Unexpected error %s %s: %s (%s)",
-                device_addr,
+                "%s: unexpected error trying to %s: %s (%s)",
+                self._log_prefix,
                 action,
-                self._attr_name,
                 err,
                 type(err).__name__,
             )
@@ -129,42 +167,53 @@ class BLECharSwitch(CoordinatorEntity, SwitchEntity, RestoreEntity):
             raise
 
     async def async_turn_on(self, **kwargs):
-        """Turn the switch on."""
-        await self._async_write_with_availability_check(b"\x01", "turn on")
+        """Turn the switch on.
+
+        Skipped when the switch is already on, that state was written and
+        acknowledged in this session and the device has not been unavailable
+        since. Toggle off and on again to force a write.
+        """
+        if (
+            self._attr_is_on
+            and self._state_confirmed
+            and self.coordinator.available
+        ):
+            return
+        
+        self._state_confirmed = False
+        acked = await self._async_write_with_availability_check(
+            self._ON_PAYLOAD, self._ON_ACTION
+        )
         self._attr_is_on = True
+        self._state_confirmed = acked
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs):
-        """Turn the switch off."""
-        await self._async_write_with_availability_check(b"\x00", "turn off")
+        """Turn the switch off.
+
+        Skipped under the same conditions as async_turn_on.
+        """
+        if (
+            not self._attr_is_on
+            and self._state_confirmed
+            and self.coordinator.available
+        ):
+            return
+        
+        self._state_confirmed = False
+        acked = await self._async_write_with_availability_check(
+            self._OFF_PAYLOAD, self._OFF_ACTION
+        )
         self._attr_is_on = False
+        self._state_confirmed = acked
         self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
         """Return if entity is available."""
-        is_available = self.coordinator.available
-        _LOGGER.debug(
-            "[%s] %s availability check: %s",
-            self.coordinator.ble_device.address,
-            self._attr_name,
-            is_available,
-        )
-        return is_available
-
-    @property
-    def device_info(self):
-        """Return device metadata for the UI."""
-        data = getattr(self._entry, "data", {})
-        name = data.get("name", f"BLE Device {self.coordinator.ble_device.address}")
-        manufacturer = data.get("manufacturer", "Custom BLE")
-        
-        return {
-            "identifiers": {(DOMAIN, self.coordinator.ble_device.address)},
-            "connections": {("bluetooth", self.coordinator.ble_device.address)},
-            "name": name,
-            "manufacturer": manufacturer,
-        }
+        # CoordinatorEntity.available expects a DataUpdateCoordinator, so
+        # return the value synced from the coordinator instead
+        return self._attr_available
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
@@ -174,57 +223,96 @@ async def async_setup_entry(hass, entry, async_add_entities):
     # Get coordinator from hass.data
     coordinator = hass.data[DOMAIN][entry.entry_id]
     
-    # Get characteristics from config
-    data = {**entry.data, **(entry.options or {})}
-    chars = data.get(CONF_CHARS, [])
+    # Get characteristics from config (options override data)
+    chars = (entry.options or {}).get(CONF_CHARS, entry.data.get(CONF_CHARS, []))
 
     if not chars:
         _LOGGER.warning(
             "[%s] No characteristics defined. Use Configure to add characteristics.",
-            coordinator.ble_device.address,
+            coordinator.address,
         )
-        await _async_remove_orphaned_entities(hass, entry, set())
+        await _async_remove_orphaned_entities(hass, entry, frozenset())
         return
 
+    # Get current unique IDs straight from the config
+    address_normalized = coordinator.address_normalized
+    current_unique_ids = frozenset(
+        _make_unique_id(address_normalized, ch["uuid"]) for ch in chars
+    )
+    
+    # Remove entities that are no longer in the config
+    await _async_remove_orphaned_entities(hass, entry, current_unique_ids)
+    
+    # Look up last states from the restore cache once for all entities
+    ent_reg = er.async_get(hass)
+    last_states = restore_state.async_get(hass).last_states
+    
+    def _restored_state(char_uuid: str) -> State | None:
+        entity_id = ent_reg.async_get_entity_id(
+            SWITCH_DOMAIN, DOMAIN, _make_unique_id(address_normalized, char_uuid)
+        )
+        if entity_id is None or (stored := last_states.get(entity_id)) is None:
+            return None
+        return stored.state
+    
     # Create entities for current characteristics
     entities = [
-        BLECharSwitch(coordinator, ch["name"], ch["uuid"], entry)
+        BLECharSwitch(
+            coordinator, ch["name"], ch["uuid"], entry, _restored_state(ch["uuid"])
+        )
         for ch in chars
     ]
     
-    # Get current unique IDs
-    current_unique_ids = {entity.unique_id for entity in entities}
-    
-    # Remove entities that are no longer in the config
-    await _async_remove_orphaned_entities(hass, entry, current_unique_ids)
-    
     _LOGGER.info(
         "[%s] Adding %d BLE switch entities",
-        coordinator.ble_device.address,
+        coordinator.address,
         len(entities),
     )
     async_add_entities(entities)
 
 
 async def _async_remove_orphaned_entities(
-    hass, entry, current_unique_ids: set[str]
+    hass, entry, current_unique_ids: frozenset[str]
 ):
     """Remove entities that are no longer in the config."""
     ent_reg = er.async_get(hass)
+    known = hass.data.setdefault(DATA_UNIQUE_IDS, {})
+    previous_unique_ids = known.get(entry.entry_id)
+    known[entry.entry_id] = current_unique_ids
     
-    # Find all entities for this config entry
-    entities = er.async_entries_for_config_entry(ent_reg, entry.entry_id)
-    
-    removed_count = 0
-    for entity_entry in entities:
-        if entity_entry.unique_id not in current_unique_ids:
-            _LOGGER.info(
-                "Removing orphaned entity: %s (unique_id: %s)",
-                entity_entry.entity_id,
-                entity_entry.unique_id,
+    if previous_unique_ids is not None:
+        # Reload: only ids dropped since the last setup can be orphans
+        if previous_unique_ids == current_unique_ids:
+            return
+        orphans = [
+            (entity_id, unique_id)
+            for unique_id in previous_unique_ids - current_unique_ids
+            if (
+                entity_id := ent_reg.async_get_entity_id(
+                    SWITCH_DOMAIN, DOMAIN, unique_id
+                )
+            )
+            is not None
+        ]
+    else:
+        # First setup since start: index this entry's entities by unique_id
+        existing = {
+            entity_entry.unique_id: entity_entry.entity_id
+            for entity_entry in er.async_entries_for_config_entry(
+                ent_reg, entry.entry_id
             )
-            ent_reg.async_remove(entity_entry.entity_id)
-            removed_count += 1
+        }
+        orphans = [
+            (existing[unique_id], unique_id)
+            for unique_id in existing.keys() - current_unique_ids
+        ]
+    
+    if not orphans:
+        return
+    
+    _LOGGER.info("Removing %d orphaned entities: %s", len(orphans), orphans)
     
-    if removed_count > 0:
-        _LOGGER.info("Removed %d orphaned entities", removed_count)
+    # No bulk-remove API in the entity registry, remove in one tight loop
+    remove = ent_reg.async_remove
+    for entity_id, _ in orphans:
+        remove(entity_id)